@@ -7,22 +7,37 @@ import json
 import os
 import re
 import socket
+import sys
+import threading
 import time
-import uuid
+import secrets
 import csv
+import functools
+import gzip
+import hashlib
+import heapq
 import io
-from datetime import datetime
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from email.parser import HeaderParser
 from pathlib import Path
 
-from flask import Flask, jsonify, request, send_from_directory, Response
+import orjson
+import requests
+from requests.adapters import HTTPAdapter
+from flask import Flask, abort, jsonify, request, Response
+from flask.json.provider import DefaultJSONProvider
 from ytmusicapi import YTMusic
 
 # ─── Paths ──────────────────────────────────────────────────────────────────
 BASE_DIR = Path(__file__).resolve().parent
 DATA_DIR = BASE_DIR / "data"
 RATINGS_FILE = DATA_DIR / "ratings.json"
+RATINGS_LOG = DATA_DIR / "ratings.log"  # append-only changes since the last snapshot
 UNRATED_FILE = DATA_DIR / "unrated.json"
+UNRATED_LOG = DATA_DIR / "unrated.log"  # append-only changes since unrated.json was last written
 SETTINGS_FILE = DATA_DIR / "settings.json"
+ALBUM_YEARS_FILE = DATA_DIR / "album_years.json"  # album id → year, kept across restarts
 BROWSER_AUTH_FILE = BASE_DIR / "browser.json"
 
 DEFAULT_SETTINGS = {
@@ -32,12 +47,80 @@ DEFAULT_SETTINGS = {
     "sidebarMode": "album",
 }
 
+# ─── JSON Helpers ───────────────────────────────────────────────────────────
+def _loads(data):
+    """Parse JSON from bytes or str (orjson — several times faster than stdlib)."""
+    return orjson.loads(data)
+
+
+def _dumps(obj, pretty=True):
+    """Serialize to UTF-8 JSON bytes for the data files (indented unless pretty=False)."""
+    option = orjson.OPT_NON_STR_KEYS
+    if pretty:
+        option |= orjson.OPT_INDENT_2
+    return orjson.dumps(obj, option=option)
+
+
+def _json_response(obj, status=200):
+    """Serialize straight to a JSON Response, skipping jsonify() for hot endpoints."""
+    return Response(orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS), status=status,
+                    mimetype="application/json")
+
+
+def _new_id():
+    """Random 128-bit id for a new rating/unrated entry, as 32 hex chars."""
+    return secrets.token_hex(16)
+
+
+# (epoch second, formatted string) of the last _now_iso() call
+_now_iso_cache = (0, "")
+
+
+def _now_iso():
+    """Local time as an ISO-8601 string to the second, for ratedAt/updatedAt/skippedAt.
+
+    Formatted at most once per second; bursts of writes reuse the string.
+    """
+    global _now_iso_cache
+    now = int(time.time())
+    if _now_iso_cache[0] != now:
+        _now_iso_cache = (now, time.strftime("%Y-%m-%dT%H:%M:%S", time.localtime(now)))
+    return _now_iso_cache[1]
+
+
 # ─── Flask App ──────────────────────────────────────────────────────────────
+class OrjsonProvider(DefaultJSONProvider):
+    """Route jsonify() and request.get_json() through orjson."""
+
+    def dumps(self, obj, **kwargs):
+        return orjson.dumps(obj, default=self.default, option=orjson.OPT_NON_STR_KEYS).decode()
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
+
 app = Flask(__name__, static_folder="static", static_url_path="")
+app.json = OrjsonProvider(app)
 
 # ─── YTMusic Init ───────────────────────────────────────────────────────────
 ytmusic = None
 
+# At most this many YouTube Music requests in flight at once, across all
+# threads; the client's connection pool is sized to match
+YT_MAX_CONCURRENT = 8
+_yt_slots = threading.BoundedSemaphore(YT_MAX_CONCURRENT)
+YT_TIMEOUT = 30  # seconds per HTTP request, so a hung call can't hold a slot
+
+
+def _new_ytmusic():
+    """Create a YTMusic client whose HTTP session keeps enough pooled connections."""
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=4, pool_maxsize=YT_MAX_CONCURRENT * 2, max_retries=2)
+    session.mount("https://", adapter)
+    # ytmusicapi only sets its 30 s timeout on sessions it creates itself
+    session.request = functools.partial(session.request, timeout=YT_TIMEOUT)
+    return YTMusic(str(BROWSER_AUTH_FILE), requests_session=session)
+
 
 def init_ytmusic():
     """Initialize YTMusic client with browser credentials."""
@@ -47,7 +130,7 @@ def init_ytmusic():
         return False
 
     try:
-        ytmusic = YTMusic(str(BROWSER_AUTH_FILE))
+        ytmusic = _new_ytmusic()
         print("✓ YTMusic authenticated successfully.")
         return True
     except Exception as e:
@@ -57,157 +140,567 @@ def init_ytmusic():
 
 # ─── Ratings Persistence (in-memory cache + crash-safe writes) ──────────────
 import atexit
-import threading
+
+_data_dir_ready = False
+
 
 def _ensure_data_dir():
+    """Create DATA_DIR and an empty ratings file. Only the first call touches the disk."""
+    global _data_dir_ready
+    if _data_dir_ready:
+        return
     DATA_DIR.mkdir(exist_ok=True)
     if not RATINGS_FILE.exists():
-        with open(RATINGS_FILE, "w") as f:
-            json.dump([], f)
+        with open(RATINGS_FILE, "wb") as f:
+            f.write(_dumps([]))
+    _data_dir_ready = True
+
+
+def _write_atomic(path, data):
+    """Write bytes to a .tmp file, fsync it, then os.replace it over `path`.
+
+    A crash mid-write leaves the previous file intact, and the data is on disk
+    before any log it supersedes is deleted.
+    """
+    tmp_file = str(path) + ".tmp"
+    with open(tmp_file, "wb") as f:
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_file, path)
+
+
+def _mtime(path):
+    """Return the file's mtime in ns, or None if it doesn't exist."""
+    try:
+        return os.stat(path).st_mtime_ns
+    except FileNotFoundError:
+        return None
 
-# In-memory cache — loaded once, mutated in-place, flushed to disk atomically
+# In-memory cache — loaded once, mutated in-place, flushed to disk atomically.
+# Single-entry changes are appended to RATINGS_LOG; the full snapshot is only
+# rewritten once the log has grown past LOG_COMPACT_THRESHOLD records.
+LOG_COMPACT_THRESHOLD = 200
 _ratings_cache = None
+_ratings_mtime = None  # RATINGS_FILE mtime the cache was loaded from / last wrote
 _ratings_dirty = False
+_ratings_log_count = 0
 _ratings_lock = threading.Lock()
+_ratings_version = 0  # bumped on every mutation; used to key derived caches
+
+# id / videoId → rating entry, kept in step with _ratings_cache for O(1) lookups
+_ratings_by_id = {}
+_ratings_by_video = {}
+
+# Serializes cache (re)loads and the check-then-write sequences in the mutating routes
+_write_lock = threading.RLock()
+
+
+# rating id → (lowercased artist, lowercased title/artist/album/notes/tags), built
+# lazily by the artist filter and smart search
+_search_text = {}
+
+
+def _reindex_ratings():
+    """Rebuild the id/videoId indexes from the cached ratings list."""
+    global _ratings_by_id, _ratings_by_video
+    _ratings_by_id = {r["id"]: r for r in _ratings_cache if r.get("id")}
+    _ratings_by_video = {r["videoId"]: r for r in _ratings_cache if r.get("videoId")}
+    _search_text.clear()
+
+
+def _index_rating(entry):
+    """Add a newly appended rating to the lookup indexes."""
+    _ratings_by_id[entry["id"]] = entry
+    _ratings_by_video[entry["videoId"]] = entry
+
+
+def _rating_search_fields(r):
+    """Return (lowercased artist, searchable text) for a rating, cached on first use."""
+    fields = _search_text.get(r.get("id"))
+    if fields is None:
+        artist = (r.get("artist") or "").lower()
+        text = " ".join((
+            r.get("title") or "",
+            r.get("artist") or "",
+            r.get("album") or "",
+            r.get("notes") or "",
+            " ".join(r.get("tags") or []),
+        )).lower()
+        fields = (artist, text)
+        if r.get("id"):
+            _search_text[r["id"]] = fields
+    return fields
+
+
+def _rating_search_text(r):
+    """Return the lowercased title/artist/album/notes/tags text the smart search matches."""
+    return _rating_search_fields(r)[1]
+
+def _ratings_cache_fresh():
+    """True if the cached ratings can be served without going back to disk."""
+    return _ratings_cache is not None and (_ratings_dirty or _mtime(RATINGS_FILE) == _ratings_mtime)
+
 
 def _load_ratings():
-    """Return the in-memory ratings list. Loads from disk on first call."""
-    global _ratings_cache
-    if _ratings_cache is None:
+    """Return the in-memory ratings list.
+
+    Loads from disk on first call, and reloads if RATINGS_FILE was changed by
+    something else while the cache holds no unflushed changes. The common
+    cache-hit path is a single stat() and takes no lock.
+    """
+    global _ratings_cache, _ratings_mtime, _ratings_version
+    if _ratings_cache_fresh():
+        return _ratings_cache
+    with _write_lock:
+        if _ratings_cache_fresh():  # another thread reloaded while we waited
+            return _ratings_cache
         _ensure_data_dir()
+        with _ratings_lock:
+            _ratings_mtime = _mtime(RATINGS_FILE)
+            try:
+                with open(RATINGS_FILE, "rb") as f:
+                    _ratings_cache = _loads(f.read())
+            except (json.JSONDecodeError, FileNotFoundError):
+                _ratings_cache = []
+            _replay_ratings_log()
+            _normalize_ratings()
+            _reindex_ratings()
+            _ratings_version += 1
+        return _ratings_cache
+
+def _normalize_ratings():
+    """Validate rating values once at load: anything non-numeric becomes None.
+
+    The API only ever stores numbers, so afterwards hot loops can test
+    `rating is not None` instead of repeating isinstance() checks. The exact
+    type() test also rejects booleans, matching _rating_error().
+    """
+    numeric = (int, float)
+    for r in _ratings_cache:
+        if type(r.get("rating")) not in numeric:
+            r["rating"] = None
+
+def _replay_log(path, items):
+    """Apply put/delete records from an append-only log to `items` in place.
+
+    Returns the number of records read. A torn last line left by a crash
+    mid-append is cut off the file, so the next append starts on a fresh line.
+    """
+    try:
+        data = path.read_bytes()
+    except FileNotFoundError:
+        return 0
+    end = data.rfind(b"\n") + 1
+    if end < len(data):
+        # Never acknowledged: _append_log() only returns once the newline is fsynced
+        with open(path, "r+b") as f:
+            f.truncate(end)
+            f.flush()
+            os.fsync(f.fileno())
+        data = data[:end]
+    lines = data.splitlines()
+    positions = {r.get("id"): i for i, r in enumerate(items)}
+    deleted = set()
+    count = 0
+    for line in lines:
         try:
-            with open(RATINGS_FILE, "r", encoding="utf-8") as f:
-                _ratings_cache = json.load(f)
-        except (json.JSONDecodeError, FileNotFoundError):
-            _ratings_cache = []
-    return _ratings_cache
+            record = _loads(line)
+        except json.JSONDecodeError:
+            continue  # blank or otherwise unreadable line
+        entry = record.get("entry")
+        if record.get("op") == "put" and entry:
+            i = positions.get(entry.get("id"))
+            if i is None:
+                positions[entry.get("id")] = len(items)
+                items.append(entry)
+            else:
+                items[i] = entry
+        elif record.get("op") == "delete":
+            i = positions.pop(record.get("id"), None)
+            if i is not None:
+                deleted.add(i)
+        count += 1
+    if deleted:
+        items[:] = [r for i, r in enumerate(items) if i not in deleted]
+    return count
+
+def _append_log(path, record):
+    """Append one JSON record as a line to an append-only log and fsync it.
+
+    A rating is on disk once its request returns, without rewriting the snapshot.
+    """
+    _ensure_data_dir()
+    with open(path, "ab") as f:
+        f.write(orjson.dumps(record) + b"\n")
+        f.flush()
+        os.fsync(f.fileno())
+
+def _replay_ratings_log():
+    """Apply records from RATINGS_LOG on top of the snapshot just loaded."""
+    global _ratings_dirty, _ratings_log_count
+    _ratings_log_count = _replay_log(RATINGS_LOG, _ratings_cache)
+    if _ratings_log_count:
+        _ratings_dirty = True
 
-def _save_ratings(ratings=None):
-    """Mark cache dirty and flush to disk atomically (write-tmp + rename)."""
-    global _ratings_cache, _ratings_dirty
+def _log_ratings_record(record):
+    """Persist one change by appending it to RATINGS_LOG (O(1) bytes)."""
+    global _ratings_dirty, _ratings_log_count, _ratings_version
     with _ratings_lock:
-        if ratings is not None:
-            _ratings_cache = ratings
+        _append_log(RATINGS_LOG, record)
         _ratings_dirty = True
-    _flush_ratings()
-
-def _flush_ratings():
-    """Atomic write: write to .tmp file, then os.replace to avoid corruption."""
-    global _ratings_dirty
+        _ratings_log_count += 1
+        _ratings_version += 1
+        if _ratings_log_count >= LOG_COMPACT_THRESHOLD:
+            _flush_event.set()
+
+def _log_rating(entry):
+    """Persist one added/edited rating."""
+    _log_ratings_record({"op": "put", "entry": entry})
+
+def _remove_rating(entry):
+    """Drop a rating from the cache and indexes, and log the delete."""
+    _ratings_cache.remove(entry)
+    _ratings_by_id.pop(entry["id"], None)
+    if _ratings_by_video.get(entry.get("videoId")) is entry:
+        del _ratings_by_video[entry["videoId"]]
+    _search_text.pop(entry["id"], None)
+    _log_ratings_record({"op": "delete", "id": entry["id"]})
+
+def _flush_ratings(force=True):
+    """Atomic write: write to .tmp file, then os.replace to avoid corruption.
+
+    Rewriting the snapshot folds in and clears RATINGS_LOG. With force=False a
+    log that is still below LOG_COMPACT_THRESHOLD is left alone.
+    """
+    global _ratings_dirty, _ratings_log_count, _ratings_mtime
     with _ratings_lock:
         if _ratings_cache is None or not _ratings_dirty:
             return
+        if not force and 0 < _ratings_log_count < LOG_COMPACT_THRESHOLD:
+            return
         _ensure_data_dir()
-        tmp_file = str(RATINGS_FILE) + ".tmp"
-        with open(tmp_file, "w", encoding="utf-8") as f:
-            json.dump(_ratings_cache, f, indent=2, ensure_ascii=False)
-        os.replace(tmp_file, RATINGS_FILE)
+        _write_atomic(RATINGS_FILE, _dumps(_ratings_cache, pretty=False))
+        RATINGS_LOG.unlink(missing_ok=True)
+        _ratings_mtime = _mtime(RATINGS_FILE)
         _ratings_dirty = False
+        _ratings_log_count = 0
+
+# Compact every 60 seconds in background, or as soon as _flush_event is set
+_flush_event = threading.Event()
 
-# Auto-save every 60 seconds in background
 def _auto_save_loop():
     while True:
-        time.sleep(60)
+        _flush_event.wait(timeout=60)
+        _flush_event.clear()
         try:
-            _flush_ratings()
+            _flush_ratings(force=False)
+            _flush_album_years()
         except Exception as e:
             print(f"[auto-save] Error: {e}")
 
 _auto_save_thread = threading.Thread(target=_auto_save_loop, daemon=True)
 _auto_save_thread.start()
 
+def _shutdown_flush():
+    """Wake the auto-save thread and flush synchronously before exit."""
+    _flush_event.set()
+    _flush_ratings()
+    if _unrated_log_count and _unrated_cache is not None:
+        _save_unrated(_unrated_cache)  # fold UNRATED_LOG back into unrated.json
+    _flush_album_years()
+
 # Flush on shutdown (Ctrl+C, crash, etc.)
-atexit.register(_flush_ratings)
+atexit.register(_shutdown_flush)
 
 
 # ─── Unrated Songs Persistence ──────────────────────────────────────────────
+# In-memory cache — reloaded only when the file's mtime changes, replaced on every save
+_unrated_cache = None
+_unrated_mtime = None
+_unrated_log_count = 0
+_unrated_by_id = {}
+_unrated_video_ids = set()
+
+
+def _reindex_unrated():
+    """Rebuild the id index and videoId set from the cached unrated list."""
+    global _unrated_by_id, _unrated_video_ids
+    _unrated_by_id = {u["id"]: u for u in _unrated_cache if u.get("id")}
+    _unrated_video_ids = {u.get("videoId") for u in _unrated_cache}
+
+
 def _load_unrated():
-    _ensure_data_dir()
-    if not UNRATED_FILE.exists():
-        return []
-    try:
-        with open(UNRATED_FILE, "r", encoding="utf-8") as f:
-            return json.load(f)
-    except (json.JSONDecodeError, FileNotFoundError):
-        return []
+    """Return the in-memory unrated list, re-reading the file only if it changed."""
+    global _unrated_cache, _unrated_mtime
+    if _unrated_cache is not None and _mtime(UNRATED_FILE) == _unrated_mtime:
+        return _unrated_cache
+    with _write_lock:
+        mtime = _mtime(UNRATED_FILE)
+        if _unrated_cache is None or mtime != _unrated_mtime:
+            _ensure_data_dir()
+            try:
+                with open(UNRATED_FILE, "rb") as f:
+                    _unrated_cache = _loads(f.read())
+            except (json.JSONDecodeError, FileNotFoundError):
+                _unrated_cache = []
+            _unrated_mtime = mtime
+            _replay_unrated_log()
+            _reindex_unrated()
+        return _unrated_cache
+
+
+def _replay_unrated_log():
+    """Apply records from UNRATED_LOG on top of the snapshot just loaded."""
+    global _unrated_log_count
+    _unrated_log_count = _replay_log(UNRATED_LOG, _unrated_cache)
+
+
+def _log_unrated_record(record):
+    """Append one change to UNRATED_LOG, compacting once the log grows large."""
+    global _unrated_log_count
+    _append_log(UNRATED_LOG, record)
+    _unrated_log_count += 1
+    if _unrated_log_count >= LOG_COMPACT_THRESHOLD:
+        _save_unrated(_unrated_cache)
+
+
+def _append_unrated(entry):
+    """Add one skipped song by appending it to UNRATED_LOG instead of rewriting the file."""
+    with _write_lock:
+        _load_unrated().append(entry)
+        _unrated_by_id[entry["id"]] = entry
+        _unrated_video_ids.add(entry.get("videoId"))
+        _log_unrated_record({"op": "put", "entry": entry})
+
+
+def _remove_unrated(entry):
+    """Drop one unrated song from the cache and indexes, and log the delete."""
+    with _write_lock:
+        unrated = _load_unrated()
+        unrated.remove(entry)
+        _unrated_by_id.pop(entry["id"], None)
+        video_id = entry.get("videoId")
+        # Older data can hold the same video twice; keep it while any copy remains
+        if not any(u.get("videoId") == video_id for u in unrated):
+            _unrated_video_ids.discard(video_id)
+        _log_unrated_record({"op": "delete", "id": entry["id"]})
 
 
 def _save_unrated(unrated):
-    _ensure_data_dir()
-    with open(UNRATED_FILE, "w", encoding="utf-8") as f:
-        json.dump(unrated, f, indent=2, ensure_ascii=False)
+    """Rewrite unrated.json with the full list, folding in and clearing UNRATED_LOG."""
+    global _unrated_cache, _unrated_mtime, _unrated_log_count
+    with _write_lock:
+        _ensure_data_dir()
+        _write_atomic(UNRATED_FILE, _dumps(unrated, pretty=False))
+        UNRATED_LOG.unlink(missing_ok=True)
+        _unrated_cache = unrated
+        _unrated_mtime = _mtime(UNRATED_FILE)
+        _unrated_log_count = 0
+        _reindex_unrated()
 
 
 # ─── Settings Persistence ───────────────────────────────────────────────────
+# Parsed settings, keyed by the file's mtime so hand edits are still picked up
+_settings_cache = {"mtime": None, "data": None}
+
+
 def _load_settings():
-    _ensure_data_dir()
-    if SETTINGS_FILE.exists():
+    """Return the current settings, re-reading the file only if it changed.
+
+    The dict is shared between requests — copy it before modifying.
+    """
+    mtime = _mtime(SETTINGS_FILE)
+    if _settings_cache["data"] is not None and mtime == _settings_cache["mtime"]:
+        return _settings_cache["data"]
+    with _write_lock:
+        _ensure_data_dir()
+        settings = dict(DEFAULT_SETTINGS)
         try:
-            with open(SETTINGS_FILE, "r", encoding="utf-8") as f:
-                stored = json.load(f)
-                return {**DEFAULT_SETTINGS, **stored}
+            with open(SETTINGS_FILE, "rb") as f:
+                settings.update(_loads(f.read()))
         except (json.JSONDecodeError, FileNotFoundError):
             pass
-    return dict(DEFAULT_SETTINGS)
+        _settings_cache["mtime"] = mtime
+        _settings_cache["data"] = settings
+        return settings
 
 
 def _save_settings(settings):
-    _ensure_data_dir()
-    with open(SETTINGS_FILE, "w", encoding="utf-8") as f:
-        json.dump(settings, f, indent=2)
+    with _write_lock:
+        _ensure_data_dir()
+        _write_atomic(SETTINGS_FILE, _dumps(settings))
+        _settings_cache["mtime"] = _mtime(SETTINGS_FILE)
+        _settings_cache["data"] = dict(settings)
 
 
 # ─── History Cache ──────────────────────────────────────────────────────────
 _history_cache = {"data": None, "timestamp": 0}
 CACHE_TTL = 5  # seconds
+_history_lock = threading.Lock()
+
 
+def _history_fresh():
+    return _history_cache["data"] is not None and (time.time() - _history_cache["timestamp"]) < CACHE_TTL
+
+
+def _slim_track(track):
+    """Keep only the fields _extract_track_info() reads from a history/search item."""
+    return {
+        "videoId": track.get("videoId", ""),
+        "title": track.get("title", "Unknown"),
+        "artists": [{"name": a.get("name")} for a in track.get("artists") or []],
+        "album": track.get("album"),
+        "thumbnails": (track.get("thumbnails") or [])[-1:],  # largest only
+        "played": track.get("played", ""),
+    }
 
 
 def _get_cached_history():
-    now = time.time()
-    if _history_cache["data"] is not None and (now - _history_cache["timestamp"]) < CACHE_TTL:
+    """Return recent history, slimmed down; only the latest play is used (now-playing).
+
+    Single-flight: when the cache is stale, one thread refreshes it while any
+    concurrent callers wait and reuse that result.
+    """
+    if _history_fresh():
         return _history_cache["data"]
 
     if ytmusic is None:
         return None
 
+    with _history_lock:
+        if _history_fresh():  # refreshed by another thread while we waited
+            return _history_cache["data"]
+        try:
+            with _yt_slots:
+                history = ytmusic.get_history()
+            history = [_slim_track(t) for t in history[:1]]
+            _history_cache["data"] = history
+            _history_cache["timestamp"] = time.time()
+            _prefetch_album_years(history)
+            return history
+        except Exception as e:
+            print(f"Error fetching history: {type(e).__name__}: {e!r}")
+            return None
+
+
+# ─── Album Metadata Cache ───────────────────────────────────────────────────
+# Every get_album() goes through this one bounded cache
+@functools.lru_cache(maxsize=2048)
+def _cached_get_album(browse_id):
+    """Fetch full album data. Cached; failures raise and are not cached."""
+    with _yt_slots:
+        return ytmusic.get_album(browse_id)
+
+
+def _safe_get_album(browse_id):
+    """Like _cached_get_album(), but returns None on error."""
     try:
-        history = ytmusic.get_history()
-        _history_cache["data"] = history
-        _history_cache["timestamp"] = now
-        return history
-    except Exception as e:
-        print(f"Error fetching history: {type(e).__name__}: {e!r}")
+        return _cached_get_album(browse_id)
+    except Exception:
         return None
 
 
-# ─── Album Metadata Cache (for original release year) ──────────────────────
-_album_cache = {}
+# album id → original release year, so track info can read it without a fetch.
+# Successful lookups are persisted to ALBUM_YEARS_FILE, least recently used first
+# (dropped past MAX_ALBUM_YEARS); failed ones are skipped for ALBUM_FAILURE_TTL,
+# then retried.
+MAX_ALBUM_YEARS = 4096
+ALBUM_FAILURE_TTL = 300  # seconds
+_album_years = OrderedDict()
+_album_year_failures = {}  # album id → time.time() of the failed lookup
+_album_years_dirty = False
+# Guards the two dicts above and the dirty flag; /api/enrich updates them from a pool
+_album_years_lock = threading.Lock()
+
+
+def _load_album_years():
+    """Prime _album_years from ALBUM_YEARS_FILE."""
+    try:
+        with open(ALBUM_YEARS_FILE, "rb") as f:
+            _album_years.update(_loads(f.read()))
+    except (json.JSONDecodeError, FileNotFoundError):
+        pass
+
+
+def _flush_album_years():
+    """Write _album_years to disk if lookups were added since the last flush."""
+    global _album_years_dirty
+    with _album_years_lock:
+        if not _album_years_dirty:
+            return
+        _ensure_data_dir()
+        _write_atomic(ALBUM_YEARS_FILE, _dumps(_album_years, pretty=False))
+        _album_years_dirty = False  # only once written, so a failed write is retried
+
+
+def _cached_album_year(album_id):
+    """Return the cached year for `album_id`, or None, marking it recently used."""
+    with _album_years_lock:
+        year = _album_years.get(album_id)
+        if year is not None:
+            _album_years.move_to_end(album_id)
+        return year
 
 
 def _get_album_year(album_id):
     """Fetch album release year via get_album(). Cached."""
+    global _album_years_dirty
     if not album_id:
         return ""
-    if album_id in _album_cache:
-        return _album_cache[album_id]
-
+    year = _cached_album_year(album_id)
+    if year is not None:
+        return year
+    failed_at = _album_year_failures.get(album_id)
+    if failed_at is not None and time.time() - failed_at < ALBUM_FAILURE_TTL:
+        return ""
     if ytmusic is None:
         return ""
 
     try:
-        album = ytmusic.get_album(album_id)
-        year = album.get("year", "")
-        _album_cache[album_id] = year
-        return year
+        year = _cached_get_album(album_id).get("year", "")
     except Exception as e:
         print(f"Error fetching album {album_id}: {e}")
-        _album_cache[album_id] = ""  # cache the failure too
+        with _album_years_lock:
+            _album_year_failures.pop(album_id, None)
+            _album_year_failures[album_id] = time.time()  # skip it for a while
+            while len(_album_year_failures) > MAX_ALBUM_YEARS:
+                del _album_year_failures[next(iter(_album_year_failures))]
         return ""
+    with _album_years_lock:
+        _album_year_failures.pop(album_id, None)
+        _album_years[album_id] = year
+        while len(_album_years) > MAX_ALBUM_YEARS:
+            _album_years.popitem(last=False)
+        _album_years_dirty = True
+    return year
+
 
+# One background worker: prefetches run one at a time, so a repeat for the same
+# album finds the year already cached instead of fetching it twice
+_album_prefetch = ThreadPoolExecutor(max_workers=1)
 
-def _extract_track_info(track):
-    """Extract clean track info from a history item. Fast — no extra API calls."""
+
+def _prefetch_album_years(tracks):
+    """Start looking up missing album years for `tracks` without waiting for them.
+
+    The next poll's track info then carries the year, and /api/enrich is a cache hit.
+    """
+    for track in tracks:
+        album_id = (track.get("album") or {}).get("id")
+        if album_id and album_id not in _album_years:
+            _album_prefetch.submit(_get_album_year, album_id)
+
+
+_load_album_years()
+
+
+def _extract_track_info(track, rated=None, unrated_ids=None):
+    """Extract clean track info from a history item. Fast — no extra API calls.
+
+    Callers converting a batch of tracks can pass the videoId → rating index and
+    unrated videoId set, loaded once, instead of revalidating the caches per track.
+    """
     video_id = track.get("videoId", "")
     title = track.get("title", "Unknown")
     artists = ", ".join(a.get("name", "") for a in track.get("artists", []) if a.get("name"))
@@ -223,24 +716,26 @@ def _extract_track_info(track):
     thumbnails = track.get("thumbnails", [])
     album_art = ""
     if thumbnails:
-        # Pick the largest thumbnail
-        best = max(thumbnails, key=lambda t: t.get("width", 0) * t.get("height", 0))
-        album_art = best.get("url", "")
+        # ytmusicapi lists thumbnails smallest to largest, as the album endpoints rely on too
+        album_art = thumbnails[-1].get("url", "")
         # Strip size params from YouTube thumbnail URLs to get full resolution
         if album_art and "lh3.googleusercontent.com" in album_art:
-            album_art = album_art.split("=")[0] + "=w512-h512-l90-rj"
+            album_art = album_art.partition("=")[0] + "=w512-h512-l90-rj"
     # Fallback: YouTube video thumbnail
     if not album_art and video_id:
         album_art = f"https://i.ytimg.com/vi/{video_id}/hqdefault.jpg"
 
     # Use cached album year if available
-    year = _album_cache.get(album_id, "") if album_id else ""
+    year = (_cached_album_year(album_id) or "") if album_id else ""
 
     # Check ratings and unrated lists for this song (use dict for O(1) lookup)
-    ratings = _load_ratings()
-    existing = next((r for r in ratings if r.get("videoId") == video_id), None)
-    unrated = _load_unrated()
-    unrated_ids = {u.get("videoId") for u in unrated}
+    if rated is None:
+        _load_ratings()
+        rated = _ratings_by_video
+    if unrated_ids is None:
+        _load_unrated()
+        unrated_ids = _unrated_video_ids
+    existing = rated.get(video_id)
     already_unrated = video_id in unrated_ids
 
     return {
@@ -258,55 +753,227 @@ def _extract_track_info(track):
     }
 
 
+# ─── Page Cache ─────────────────────────────────────────────────────────────
+# filename → (mtime_ns, etag, raw bytes, gzipped bytes); rebuilt when the file changes
+_page_cache = {}
+
+
+def _send_page(filename):
+    """Serve an HTML page from memory, gzipped when the client accepts it.
+
+    Uses ETag revalidation (304) rather than a long max-age so the service
+    worker's background refresh still picks up new versions right away.
+    """
+    path = Path(app.static_folder) / filename
+    try:
+        mtime = path.stat().st_mtime_ns
+        cached = _page_cache.get(filename)
+        if cached is None or cached[0] != mtime:
+            raw = path.read_bytes()
+            cached = (mtime, hashlib.md5(raw).hexdigest(), raw, gzip.compress(raw))
+            _page_cache[filename] = cached
+    except FileNotFoundError:
+        abort(404)
+    _, etag, raw, gzipped = cached
+
+    if "gzip" in request.accept_encodings:
+        resp = Response(gzipped, mimetype="text/html")
+        resp.headers["Content-Encoding"] = "gzip"
+        resp.set_etag(etag + "-gz")
+    else:
+        resp = Response(raw, mimetype="text/html")
+        resp.set_etag(etag)
+    resp.headers["Vary"] = "Accept-Encoding"
+    resp.headers["Cache-Control"] = "no-cache"
+    return resp.make_conditional(request)
+
+
 # ─── API Routes ─────────────────────────────────────────────────────────────
 @app.route("/")
 def index():
-    return send_from_directory(app.static_folder, "index.html")
+    return _send_page("index.html")
 
 
 @app.route("/analytics")
 def analytics_page():
-    return send_from_directory(app.static_folder, "analytics.html")
+    return _send_page("analytics.html")
+
+
+# ─── Conditional GET for ratings-derived responses ─────────────────────────
+# Changes every run, so an ETag from before a restart never matches by accident
+_BOOT_ID = secrets.token_hex(16)
+
+
+def _ratings_etag(version, *parts):
+    """Weak ETag for a response built from the ratings at `version`.
+
+    Pass the version read before loading the ratings, so the tag always
+    matches the data the body was built from.
+    """
+    key = "|".join(str(p) for p in (_BOOT_ID, version, *parts))
+    return hashlib.md5(key.encode()).hexdigest()
+
+
+def _not_modified(etag):
+    """Return a 304 response if the client already holds `etag`, else None."""
+    if request.if_none_match.contains_weak(etag):
+        resp = Response(status=304)
+        resp.set_etag(etag, weak=True)
+        resp.headers["Cache-Control"] = "no-cache"
+        return resp
+    return None
+
+
+def _with_etag(resp, etag):
+    resp.set_etag(etag, weak=True)
+    resp.headers["Cache-Control"] = "no-cache"
+    return resp
+
+
+# Analytics response bodies for the current ratings version, one per query
+# (shrinkage c / splitArtists / limit), least recently used first
+ANALYTICS_CACHE_SIZE = 16
+_analytics_cache = {"version": None, "bodies": OrderedDict()}
+_analytics_lock = threading.Lock()  # request threads share the LRU above
+
+
+def _rank_by_adjusted(items, limit):
+    """Sort by adjustedScore, best first. With a limit, only the top `limit` are kept."""
+    key = lambda x: x["adjustedScore"]
+    if 0 < limit < len(items):
+        return heapq.nlargest(limit, items, key=key)
+    return sorted(items, key=key, reverse=True)
+
+
+def _add_score(acc, score):
+    """Fold one score into a running count/total/min/max accumulator."""
+    if acc["n"] == 0:
+        acc["min"] = acc["max"] = score
+    elif score < acc["min"]:
+        acc["min"] = score
+    elif score > acc["max"]:
+        acc["max"] = score
+    acc["n"] += 1
+    acc["total"] += score
 
 
 @app.route("/api/analytics")
 def api_analytics():
     """Comprehensive analytics with Bayesian adjusted scores."""
+    version = _ratings_version  # before loading, like get_ratings
     ratings = _load_ratings()
     settings = _load_settings()
     shrinkage_c = float(request.args.get("c", settings.get("shrinkageC", 5)))
     split_artists = request.args.get("splitArtists", "0") == "1"
+    limit = request.args.get("limit", 0, type=int)  # top-N artists/albums; 0 = all
+
+    etag = _ratings_etag(version, "analytics", shrinkage_c, split_artists, limit)
+    not_modified = _not_modified(etag)
+    if not_modified:
+        return not_modified
+
+    cache_key = (shrinkage_c, split_artists, limit)
+    with _analytics_lock:
+        if _analytics_cache["version"] != version:
+            _analytics_cache["bodies"] = OrderedDict()
+            _analytics_cache["version"] = version
+        bodies = _analytics_cache["bodies"]
+        body = bodies.get(cache_key)
+        if body is not None:
+            bodies.move_to_end(cache_key)
+    if body is not None:
+        return _with_etag(Response(body, mimetype="application/json"), etag)
 
     if not ratings:
-        return jsonify({"artists": [], "albums": [], "timeline": [],
-                        "distribution": {}, "decades": {}, "tags": [],
-                        "globalMean": 0, "totalSongs": 0, "shrinkageC": shrinkage_c})
-
-    # Global mean
-    all_scores = [r["rating"] for r in ratings if isinstance(r.get("rating"), (int, float))]
-    global_mean = sum(all_scores) / len(all_scores) if all_scores else 0
+        return _with_etag(jsonify({"artists": [], "albums": [], "timeline": [],
+                                   "distribution": {}, "decades": {}, "tags": [],
+                                   "globalMean": 0, "totalSongs": 0, "shrinkageC": shrinkage_c}), etag)
 
-    # ── Artist rankings ──
+    # ── Single pass: feed every accumulator from each rating ──
     artist_data = {}
+    album_data = {}
+    timeline = {}
+    distribution = {}
+    decades = {}
+    tag_data = {}
+    score_sum = 0
+    score_count = 0
     for r in ratings:
+        rating = r["rating"]
+        is_num = rating is not None
+        if is_num:
+            score_sum += rating
+            score_count += 1
+            key = str(int(round(rating)))
+            distribution[key] = distribution.get(key, 0) + 1
+
+        # Artists — split multi-artist credits if enabled, otherwise treat as single
         raw_artist = r.get("artist", "Unknown")
-        # Split multi-artist credits if enabled, otherwise treat as single
-        artist_names = [a.strip() for a in raw_artist.split(",")] if split_artists else [raw_artist]
+        album = r.get("album", "")
+        artist_names = [a.strip() for a in raw_artist.split(",")] if split_artists else (raw_artist,)
         for a in artist_names:
             if not a:
                 continue
-            if a not in artist_data:
-                artist_data[a] = {"scores": [], "albums": set()}
-            if isinstance(r.get("rating"), (int, float)):
-                artist_data[a]["scores"].append(r["rating"])
-            artist_data[a]["albums"].add(r.get("album", ""))
+            d = artist_data.get(a)
+            if d is None:
+                d = artist_data[a] = {"n": 0, "total": 0, "min": None, "max": None, "albums": set()}
+            if is_num:
+                _add_score(d, rating)
+            d["albums"].add(album)
+
+        # Albums
+        album_key = album or "Unknown"
+        d = album_data.get(album_key)
+        if d is None:
+            d = album_data[album_key] = {
+                "n": 0, "total": 0, "min": None, "max": None, "artist": r.get("artist", ""),
+                "year": r.get("year", ""), "albumArt": r.get("albumArt", "")
+            }
+        if is_num:
+            _add_score(d, rating)
 
+        # Timeline (ratings per day)
+        day = r.get("ratedAt", "")[:10]
+        if day:
+            d = timeline.get(day)
+            if d is None:
+                d = timeline[day] = {"count": 0, "totalRating": 0}
+            d["count"] += 1
+            if is_num:
+                d["totalRating"] += rating
+
+        # Decades
+        year = r.get("year", "")
+        if year and str(year).isdigit():
+            decade = str(int(year) // 10 * 10) + "s"
+            d = decades.get(decade)
+            if d is None:
+                d = decades[decade] = {"count": 0, "totalRating": 0}
+            d["count"] += 1
+            if is_num:
+                d["totalRating"] += rating
+
+        # Tags
+        for tag in (r.get("tags") or []):
+            t = tag.strip().lower()
+            if not t:
+                continue
+            d = tag_data.get(t)
+            if d is None:
+                d = tag_data[t] = {"count": 0, "totalRating": 0}
+            d["count"] += 1
+            if is_num:
+                d["totalRating"] += rating
+
+    global_mean = score_sum / score_count if score_count else 0
+
+    # ── Artist rankings ──
     artists = []
     for name, d in artist_data.items():
-        n = len(d["scores"])
+        n = d["n"]
         if n == 0:
             continue
-        total = sum(d["scores"])
+        total = d["total"]
         avg = total / n
         adjusted = (n * avg + shrinkage_c * global_mean) / (n + shrinkage_c)
         artists.append({
@@ -316,31 +983,20 @@ def api_analytics():
             "avgScore": round(avg, 3),
             "adjustedScore": round(adjusted, 3),
             "albumCount": len(d["albums"]),
-            "minRating": min(d["scores"]),
-            "maxRating": max(d["scores"]),
+            "minRating": d["min"],
+            "maxRating": d["max"],
         })
-    artists.sort(key=lambda x: x["adjustedScore"], reverse=True)
+    artists = _rank_by_adjusted(artists, limit)
     for i, a in enumerate(artists):
         a["rank"] = i + 1
 
     # ── Album rankings ──
-    album_data = {}
-    for r in ratings:
-        album_key = r.get("album", "Unknown") or "Unknown"
-        if album_key not in album_data:
-            album_data[album_key] = {
-                "scores": [], "artist": r.get("artist", ""),
-                "year": r.get("year", ""), "albumArt": r.get("albumArt", "")
-            }
-        if isinstance(r.get("rating"), (int, float)):
-            album_data[album_key]["scores"].append(r["rating"])
-
     albums = []
     for name, d in album_data.items():
-        n = len(d["scores"])
+        n = d["n"]
         if n == 0:
             continue
-        total = sum(d["scores"])
+        total = d["total"]
         avg = total / n
         adjusted = (n * avg + shrinkage_c * global_mean) / (n + shrinkage_c)
         albums.append({
@@ -352,23 +1008,14 @@ def api_analytics():
             "totalScore": round(total, 2),
             "avgScore": round(avg, 3),
             "adjustedScore": round(adjusted, 3),
-            "minRating": min(d["scores"]),
-            "maxRating": max(d["scores"]),
+            "minRating": d["min"],
+            "maxRating": d["max"],
         })
-    albums.sort(key=lambda x: x["adjustedScore"], reverse=True)
+    albums = _rank_by_adjusted(albums, limit)
     for i, a in enumerate(albums):
         a["rank"] = i + 1
 
     # ── Timeline (ratings per day) ──
-    timeline = {}
-    for r in ratings:
-        day = r.get("ratedAt", "")[:10]
-        if day:
-            if day not in timeline:
-                timeline[day] = {"count": 0, "totalRating": 0}
-            timeline[day]["count"] += 1
-            if isinstance(r.get("rating"), (int, float)):
-                timeline[day]["totalRating"] += r["rating"]
     timeline_list = []
     for day, d in sorted(timeline.items()):
         timeline_list.append({
@@ -377,23 +1024,7 @@ def api_analytics():
             "avgRating": round(d["totalRating"] / d["count"], 2) if d["count"] else 0,
         })
 
-    # ── Rating distribution ──
-    distribution = {}
-    for s in all_scores:
-        key = str(int(round(s)))
-        distribution[key] = distribution.get(key, 0) + 1
-
     # ── Decade distribution ──
-    decades = {}
-    for r in ratings:
-        year = r.get("year", "")
-        if year and str(year).isdigit():
-            decade = str(int(year) // 10 * 10) + "s"
-            if decade not in decades:
-                decades[decade] = {"count": 0, "totalRating": 0}
-            decades[decade]["count"] += 1
-            if isinstance(r.get("rating"), (int, float)):
-                decades[decade]["totalRating"] += r["rating"]
     decades_list = {}
     for dec, d in sorted(decades.items()):
         decades_list[dec] = {
@@ -402,17 +1033,6 @@ def api_analytics():
         }
 
     # ── Tag analysis ──
-    tag_data = {}
-    for r in ratings:
-        for tag in (r.get("tags") or []):
-            t = tag.strip().lower()
-            if not t:
-                continue
-            if t not in tag_data:
-                tag_data[t] = {"count": 0, "totalRating": 0}
-            tag_data[t]["count"] += 1
-            if isinstance(r.get("rating"), (int, float)):
-                tag_data[t]["totalRating"] += r["rating"]
     tags = []
     for name, d in tag_data.items():
         tags.append({
@@ -422,7 +1042,7 @@ def api_analytics():
         })
     tags.sort(key=lambda x: x["count"], reverse=True)
 
-    return jsonify({
+    body = orjson.dumps({
         "artists": artists,
         "albums": albums,
         "timeline": timeline_list,
@@ -433,6 +1053,11 @@ def api_analytics():
         "totalSongs": len(ratings),
         "shrinkageC": shrinkage_c,
     })
+    with _analytics_lock:
+        bodies[cache_key] = body
+        if len(bodies) > ANALYTICS_CACHE_SIZE:
+            bodies.popitem(last=False)
+    return _with_etag(Response(body, mimetype="application/json"), etag)
 
 
 @app.route("/api/status")
@@ -484,7 +1109,7 @@ def api_setup_headers():
         ytmusicapi.setup(filepath=str(BROWSER_AUTH_FILE), headers_raw=headers_raw)
 
         # Re-initialize
-        ytmusic = YTMusic(str(BROWSER_AUTH_FILE))
+        ytmusic = _new_ytmusic()
         return jsonify({"success": True, "message": "Authentication saved successfully!"})
 
     except Exception as e:
@@ -498,7 +1123,8 @@ def api_setup_verify():
         return jsonify({"verified": False, "error": "Not authenticated"})
 
     try:
-        history = ytmusic.get_history()
+        with _yt_slots:
+            history = ytmusic.get_history()
         if history:
             latest = history[0]
             title = latest.get("title", "Unknown")
@@ -547,24 +1173,32 @@ def _parse_auth_headers(raw):
             pass
 
     # ── Attempt 3: Raw key: value lines (Firefox copy, Chrome manual copy)
-    lines = raw.splitlines()
-    result = {}
-    current_key = None
-    for line in lines:
-        # Skip blank lines and HTTP method lines (GET /browse, POST /browse)
+    # Skip blank lines, HTTP method lines (GET /browse, POST /browse) and
+    # pseudo-headers like :authority, :method, :path, :scheme
+    lines = []
+    for line in raw.splitlines():
         stripped = line.strip()
-        if not stripped:
+        if not stripped or stripped.startswith(":"):
             continue
         if stripped.upper().startswith(("GET ", "POST ", "PUT ", "DELETE ", "PATCH ", "OPTIONS ")):
             continue
+        lines.append(stripped)
+
+    # Well-formed blocks go through the stdlib header parser in one call; it
+    # flags anything unusual (e.g. unindented wrapped values) as a defect.
+    message = HeaderParser().parsestr("\n".join(lines) + "\n\n")
+    if not message.defects and not message.get_payload():
+        result = {k: v.strip() for k, v in message.items()}
+        if result:
+            return result
 
+    result = {}
+    current_key = None
+    for stripped in lines:
         colon_idx = stripped.find(":")
         if colon_idx > 0:
             key = stripped[:colon_idx].strip()
             value = stripped[colon_idx + 1:].strip()
-            # Skip pseudo-headers like :authority, :method, :path, :scheme
-            if key.startswith(":"):
-                continue
             result[key] = value
             current_key = key
         elif current_key:
@@ -595,21 +1229,22 @@ def update_settings():
     if not data:
         return jsonify({"error": "No data provided"}), 400
 
-    settings = _load_settings()
+    with _write_lock:  # read-modify-write: don't lose a concurrent update
+        settings = dict(_load_settings())
 
-    if "ratingMin" in data:
-        settings["ratingMin"] = int(data["ratingMin"])
-    if "ratingMax" in data:
-        settings["ratingMax"] = int(data["ratingMax"])
-    if "shrinkageC" in data:
-        settings["shrinkageC"] = max(0, float(data["shrinkageC"]))
-    if "sidebarMode" in data and data["sidebarMode"] in ("album", "related"):
-        settings["sidebarMode"] = data["sidebarMode"]
+        if "ratingMin" in data:
+            settings["ratingMin"] = int(data["ratingMin"])
+        if "ratingMax" in data:
+            settings["ratingMax"] = int(data["ratingMax"])
+        if "shrinkageC" in data:
+            settings["shrinkageC"] = max(0, float(data["shrinkageC"]))
+        if "sidebarMode" in data and data["sidebarMode"] in ("album", "related"):
+            settings["sidebarMode"] = data["sidebarMode"]
 
-    if settings["ratingMin"] >= settings["ratingMax"]:
-        return jsonify({"error": "Min must be less than max"}), 400
+        if settings["ratingMin"] >= settings["ratingMax"]:
+            return jsonify({"error": "Min must be less than max"}), 400
 
-    _save_settings(settings)
+        _save_settings(settings)
     return jsonify({"success": True, "settings": settings})
 
 
@@ -640,15 +1275,18 @@ def api_search():
         return jsonify({"results": []})
 
     try:
-        results = ytmusic.search(query, filter="songs", limit=20)
+        with _yt_slots:
+            results = ytmusic.search(query, filter="songs", limit=20)
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
+    _load_ratings()
+    _load_unrated()
     tracks = []
     for item in results:
         if item.get("resultType") != "song":
             continue
-        tracks.append(_extract_track_info(item))
+        tracks.append(_extract_track_info(item, _ratings_by_video, _unrated_video_ids))
 
     return jsonify({"results": tracks})
 
@@ -666,28 +1304,34 @@ def api_find_versions():
         return jsonify({"versions": []})
 
     title_lower = title.lower().strip()
+    artist_lower = artist.lower()
 
     try:
         # Search for the artist's albums
-        album_results = ytmusic.search(artist, filter="albums", limit=15)
+        with _yt_slots:
+            album_results = ytmusic.search(artist, filter="albums", limit=15)
         versions = []
         seen_video_ids = {current_video_id} if current_video_id else set()
-        ratings = _load_ratings()  # Load once for all version checks
+        _load_ratings()  # Make sure the videoId index is populated
 
+        # Only check albums by the matching artist
+        browse_ids = []
+        seen_browse_ids = set()
         for album_item in album_results:
             browse_id = album_item.get("browseId")
-            if not browse_id:
+            if not browse_id or browse_id in seen_browse_ids:
                 continue
+            album_artists = album_item.get("artists") or []
+            if any(artist_lower in a.get("name", "").lower() for a in album_artists):
+                seen_browse_ids.add(browse_id)
+                browse_ids.append(browse_id)
 
-            # Only check albums by the matching artist
-            album_artists = album_item.get("artists", [])
-            artist_names = [a.get("name", "").lower() for a in album_artists] if album_artists else []
-            if not any(artist.lower() in name for name in artist_names):
-                continue
+        # Fetch the albums concurrently — each is a separate network round-trip
+        with ThreadPoolExecutor(max_workers=8) as ex:
+            album_datas = list(ex.map(_safe_get_album, browse_ids))
 
-            try:
-                album_data = ytmusic.get_album(browse_id)
-            except Exception:
+        for browse_id, album_data in zip(browse_ids, album_datas):
+            if album_data is None:
                 continue
 
             album_title = album_data.get("title", "")
@@ -704,14 +1348,7 @@ def api_find_versions():
                 if track_title == title_lower and video_id and video_id not in seen_video_ids:
                     seen_video_ids.add(video_id)
 
-                    # Check rated status (ratings loaded once above)
-                    already_rated = False
-                    existing_rating = None
-                    for r in ratings:
-                        if r.get("videoId") == video_id:
-                            already_rated = True
-                            existing_rating = r
-                            break
+                    existing_rating = _ratings_by_video.get(video_id)
 
                     versions.append({
                         "videoId": video_id,
@@ -722,7 +1359,7 @@ def api_find_versions():
                         "albumArt": album_art,
                         "year": album_year,
                         "isAlbum": album_title.lower() != title_lower,
-                        "alreadyRated": already_rated,
+                        "alreadyRated": existing_rating is not None,
                         "existingRating": existing_rating,
                     })
 
@@ -742,7 +1379,7 @@ def api_album_tracks():
         return jsonify({"tracks": []})
 
     try:
-        album_data = ytmusic.get_album(album_id)
+        album_data = _cached_get_album(album_id)
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
@@ -753,8 +1390,7 @@ def api_album_tracks():
     if thumbs:
         album_art = thumbs[-1].get("url", "")
 
-    ratings = _load_ratings()
-    rated_ids = {r.get("videoId"): r for r in ratings}
+    _load_ratings()
 
     tracks = []
     for i, track in enumerate(album_data.get("tracks", [])):
@@ -762,7 +1398,7 @@ def api_album_tracks():
         artists = ", ".join(
             a.get("name", "") for a in track.get("artists", []) if a.get("name")
         ) or "Unknown Artist"
-        existing = rated_ids.get(video_id)
+        existing = _ratings_by_video.get(video_id)
         tracks.append({
             "videoId": video_id,
             "title": track.get("title", "Unknown"),
@@ -786,30 +1422,69 @@ def enrich_album(album_id):
     return jsonify({"year": year})
 
 
-def _smart_match(query, *fields):
-    """Smart search: supports OR (|), negation (- or !), exact phrases ("..."), regex (/.../), implicit AND."""
-    text = " ".join((f or "").lower() for f in fields)
-    if not query:
-        return True
+# Upper bound on album ids per batch-enrich request
+MAX_ENRICH_BATCH = 50
+
+
+@app.route("/api/enrich", methods=["POST"])
+def enrich_albums():
+    """Fetch release years for several albums at once. Body: {"albumIds": [...]}."""
+    data = request.get_json(silent=True) or {}
+    album_ids = data.get("albumIds")
+    if not isinstance(album_ids, list):
+        return jsonify({"error": "albumIds must be a list"}), 400
+    album_ids = list(dict.fromkeys(a for a in album_ids if isinstance(a, str) and a))[:MAX_ENRICH_BATCH]
+
+    # Each uncached album is a separate network round-trip — fetch them concurrently
+    with ThreadPoolExecutor(max_workers=8) as ex:
+        years = dict(zip(album_ids, ex.map(_get_album_year, album_ids)))
+    return jsonify({"years": years})
+
+
+# Smart-search token: optional negation, then "exact", /regex/i or a bare word
+_SMART_TOKEN_RE = re.compile(r'([!\-]?)(?:"([^"]*)"|/([^/]*)/(i?)|(\S+))')
+
+
+@functools.lru_cache(maxsize=256)
+def _compile_user_regex(pattern):
+    """Compile a /.../ search pattern. Cached so repeat searches skip re.compile."""
+    return re.compile(pattern, re.IGNORECASE)
 
-    or_groups = [g.strip() for g in query.split("|") if g.strip()]
-    for group in or_groups:
+
+@functools.lru_cache(maxsize=64)
+def _parse_smart_query(query):
+    """Tokenize a smart-search query into OR groups. Cached: parsed once per query, not per rating."""
+    groups = []
+    for group in query.split("|"):
+        group = group.strip()
+        if not group:
+            continue
         # Tokenize: quoted strings, regex, bare words
         tokens = []
-        import re as _re
-        for m in _re.finditer(r'([!\-]?)(?:"([^"]*)"|/([^/]*)/(i?)|(\S+))', group):
+        for m in _SMART_TOKEN_RE.finditer(group):
             negate = m.group(1) in ("-", "!")
             if m.group(2) is not None:
                 tokens.append({"negate": negate, "type": "exact", "value": m.group(2).lower()})
             elif m.group(3) is not None:
                 try:
-                    flags = _re.IGNORECASE
-                    tokens.append({"negate": negate, "type": "regex", "value": _re.compile(m.group(3), flags)})
-                except _re.error:
+                    tokens.append({"negate": negate, "type": "regex", "value": _compile_user_regex(m.group(3))})
+                except re.error:
                     tokens.append({"negate": negate, "type": "exact", "value": m.group(3).lower()})
             else:
                 tokens.append({"negate": negate, "type": "contains", "value": m.group(5).lower()})
+        groups.append(tokens)
+    return groups
+
+
+def _smart_match(query, text):
+    """Smart search: supports OR (|), negation (- or !), exact phrases ("..."), regex (/.../), implicit AND.
+
+    `text` is the pre-joined, lowercased searchable text (see _rating_search_text).
+    """
+    if not query:
+        return True
 
+    for tokens in _parse_smart_query(query):
         if all(
             (not tok["negate"]) == (
                 tok["value"].search(text) is not None if tok["type"] == "regex"
@@ -821,11 +1496,62 @@ def _smart_match(query, *fields):
     return False
 
 
+def _sort_key(sort_by):
+    """Build the list.sort() key for a ratings sort field (one dict lookup per entry)."""
+    if sort_by == "rating":
+        return lambda r: r.get("rating") or 0
+    if sort_by == "year":
+        # Years are usually strings but may be blank; never mix str and int keys
+        return lambda r: str(r.get("year") or "")
+
+    def text_key(r):
+        value = r.get(sort_by, "")
+        return value.lower() if type(value) is str else str(value)
+    return text_key
+
+
+# (ratings version, {(sort_by, reverse): sorted ratings}) — reused until the ratings change
+SORT_CACHE_SIZE = 16
+_sorted_cache = (None, {})
+
+
+def _sorted_ratings(ratings, version, sort_by, reverse):
+    """Return `ratings` sorted for /api/ratings, sorting each order once per ratings version.
+
+    `version` must be read before `ratings` was loaded. The returned list is
+    shared between requests — don't modify it.
+    """
+    global _sorted_cache
+    cached_version, orders = _sorted_cache
+    if cached_version != version:
+        orders = {}
+        _sorted_cache = (version, orders)
+    order = orders.get((sort_by, reverse))
+    if order is None:
+        order = sorted(ratings, key=_sort_key(sort_by), reverse=reverse)
+        if len(orders) < SORT_CACHE_SIZE:
+            orders[(sort_by, reverse)] = order
+    return order
+
+
+# (ratings version, _compute_stats() result), shared by every /api/ratings query
+_stats_cache = (None, None)
+
+
 @app.route("/api/ratings", methods=["GET"])
 def get_ratings():
     """Return ratings with pagination. Supports filtering, sorting, search."""
+    global _stats_cache
+    # Read before loading: a concurrent write or reload then invalidates whatever
+    # we cache or tag, instead of the old body getting the new ETag
+    version = _ratings_version
     all_ratings = _load_ratings()
 
+    etag = _ratings_etag(version, "ratings", request.query_string)
+    not_modified = _not_modified(etag)
+    if not_modified:
+        return not_modified
+
     # Optional filtering
     artist = request.args.get("artist", "").lower()
     min_rating = request.args.get("min_rating", type=int)
@@ -836,32 +1562,17 @@ def get_ratings():
     limit = request.args.get("limit", 50, type=int)
     offset = request.args.get("offset", 0, type=int)
 
-    # Work on a copy so we don't mutate the cache
-    filtered = list(all_ratings)
+    # Sorting first is equivalent (the filters keep order) and lets the order be cached
+    filtered = _sorted_ratings(all_ratings, version, sort_by, sort_order == "desc")
 
     if artist:
-        filtered = [r for r in filtered if artist in r.get("artist", "").lower()]
+        filtered = [r for r in filtered if artist in _rating_search_fields(r)[0]]
     if min_rating is not None:
-        filtered = [r for r in filtered if r.get("rating", 0) >= min_rating]
+        filtered = [r for r in filtered if r["rating"] is not None and r["rating"] >= min_rating]
     if max_rating is not None:
-        filtered = [r for r in filtered if r.get("rating", 0) <= max_rating]
+        filtered = [r for r in filtered if r["rating"] is not None and r["rating"] <= max_rating]
     if search:
-        tags_str = lambda r: " ".join(r.get("tags", []))
-        filtered = [r for r in filtered if _smart_match(
-            search,
-            r.get("title", ""),
-            r.get("artist", ""),
-            r.get("album", ""),
-            r.get("notes", ""),
-            tags_str(r),
-        )]
-
-    # Sort the copy
-    reverse = sort_order == "desc"
-    if sort_by in ("rating", "year"):
-        filtered.sort(key=lambda r: r.get(sort_by, 0) or 0, reverse=reverse)
-    else:
-        filtered.sort(key=lambda r: r.get(sort_by, "").lower() if isinstance(r.get(sort_by), str) else str(r.get(sort_by, "")), reverse=reverse)
+        filtered = [r for r in filtered if _smart_match(search, _rating_search_text(r))]
 
     total = len(filtered)
     if limit > 0:
@@ -869,13 +1580,28 @@ def get_ratings():
     else:
         page = filtered  # limit=0 means return all
 
-    return jsonify({
+    # Stats always cover the full dataset, so they only change with the ratings
+    stats_version, stats = _stats_cache
+    if stats_version != version:
+        stats = _compute_stats(all_ratings)
+        _stats_cache = (version, stats)
+
+    return _with_etag(_json_response({
         "ratings": page,
         "total": total,
         "offset": offset,
         "hasMore": limit > 0 and offset + limit < total,
-        "stats": _compute_stats(all_ratings),  # stats always on full dataset
-    })
+        "stats": stats,
+    }), etag)
+
+
+def _rating_error(rating):
+    """Return an error message if `rating` isn't a number in the configured range, else None."""
+    settings = _load_settings()
+    r_min, r_max = settings["ratingMin"], settings["ratingMax"]
+    if type(rating) not in (int, float) or not (r_min <= rating <= r_max):
+        return f"rating must be between {r_min} and {r_max}"
+    return None
 
 
 @app.route("/api/ratings", methods=["POST"])
@@ -890,35 +1616,40 @@ def add_rating():
 
     if not video_id:
         return jsonify({"error": "videoId is required"}), 400
-    settings = _load_settings()
-    r_min, r_max = settings["ratingMin"], settings["ratingMax"]
-    if rating is None or not isinstance(rating, (int, float)) or not (r_min <= rating <= r_max):
-        return jsonify({"error": f"rating must be between {r_min} and {r_max}"}), 400
+    error = _rating_error(rating)
+    if error:
+        return jsonify({"error": error}), 400
 
     ratings = _load_ratings()
 
-    # Check for duplicate
-    if any(r.get("videoId") == video_id for r in ratings):
-        return jsonify({"error": "Song already rated", "duplicate": True}), 409
+    with _write_lock:
+        # Check for duplicate
+        if video_id in _ratings_by_video:
+            return jsonify({"error": "Song already rated", "duplicate": True}), 409
 
-    entry = {
-        "id": str(uuid.uuid4()),
-        "videoId": video_id,
-        "title": data.get("title", "Unknown"),
-        "artist": data.get("artist", "Unknown Artist"),
-        "album": data.get("album", ""),
-        "year": data.get("year", ""),
-        "albumArt": data.get("albumArt", ""),
-        "rating": rating,
-        "ratedAt": datetime.now().isoformat(),
-        "tags": data.get("tags", []),
-        "notes": data.get("notes", ""),
-    }
+        entry = {
+            "id": _new_id(),
+            "videoId": video_id,
+            "title": data.get("title", "Unknown"),
+            "artist": data.get("artist", "Unknown Artist"),
+            "album": data.get("album", ""),
+            "year": data.get("year", ""),
+            "albumArt": data.get("albumArt", ""),
+            "rating": rating,
+            "ratedAt": _now_iso(),
+            "tags": data.get("tags", []),
+            "notes": data.get("notes", ""),
+        }
+
+        ratings.append(entry)
+        _index_rating(entry)
+        _log_rating(entry)
+
+    return _json_response({"success": True, "entry": entry}, 201)
 
-    ratings.append(entry)
-    _save_ratings(ratings)
 
-    return jsonify({"success": True, "entry": entry}), 201
+# Fields a PUT /api/ratings/<id> may change
+_UPDATABLE_FIELDS = frozenset(("title", "artist", "album", "year", "rating", "tags", "notes"))
 
 
 @app.route("/api/ratings/<entry_id>", methods=["PUT"])
@@ -928,40 +1659,41 @@ def update_rating(entry_id):
     if not data:
         return jsonify({"error": "No data provided"}), 400
 
-    ratings = _load_ratings()
-    entry = next((r for r in ratings if r.get("id") == entry_id), None)
-
-    if not entry:
-        return jsonify({"error": "Rating not found"}), 404
-
-    # Update allowed fields
-    updatable = ["title", "artist", "album", "year", "rating", "tags", "notes"]
-    for field in updatable:
-        if field in data:
-            if field == "rating":
-                settings = _load_settings()
-                r_min, r_max = settings["ratingMin"], settings["ratingMax"]
-                if not isinstance(data[field], (int, float)) or not (r_min <= data[field] <= r_max):
-                    return jsonify({"error": f"rating must be {r_min}-{r_max}"}), 400
+    _load_ratings()
+    with _write_lock:
+        entry = _ratings_by_id.get(entry_id)
+
+        if not entry:
+            return jsonify({"error": "Rating not found"}), 404
+
+        # Update allowed fields that actually change, validating the rating first
+        fields = [f for f in _UPDATABLE_FIELDS & data.keys() if entry.get(f) != data[f]]
+        if not fields:
+            return _json_response({"success": True, "entry": entry})  # nothing to write
+        if "rating" in fields:
+            error = _rating_error(data["rating"])
+            if error:
+                return jsonify({"error": error}), 400
+        for field in fields:
             entry[field] = data[field]
 
-    entry["updatedAt"] = datetime.now().isoformat()
-    _save_ratings(ratings)
+        entry["updatedAt"] = _now_iso()
+        _search_text.pop(entry_id, None)
+        _log_rating(entry)
 
-    return jsonify({"success": True, "entry": entry})
+    return _json_response({"success": True, "entry": entry})
 
 
 @app.route("/api/ratings/<entry_id>", methods=["DELETE"])
 def delete_rating(entry_id):
     """Delete a rating."""
-    ratings = _load_ratings()
-    original_len = len(ratings)
-    ratings = [r for r in ratings if r.get("id") != entry_id]
-
-    if len(ratings) == original_len:
-        return jsonify({"error": "Rating not found"}), 404
+    _load_ratings()
+    with _write_lock:
+        entry = _ratings_by_id.get(entry_id)
+        if not entry:
+            return jsonify({"error": "Rating not found"}), 404
 
-    _save_ratings(ratings)
+        _remove_rating(entry)
     return jsonify({"success": True})
 
 
@@ -970,7 +1702,7 @@ def delete_rating(entry_id):
 def get_unrated():
     """Return all unrated/skipped songs."""
     unrated = _load_unrated()
-    return jsonify({"unrated": unrated, "total": len(unrated)})
+    return _json_response({"unrated": unrated, "total": len(unrated)})
 
 
 @app.route("/api/unrated", methods=["POST"])
@@ -984,52 +1716,51 @@ def add_unrated():
     if not video_id:
         return jsonify({"error": "videoId is required"}), 400
 
-    # Skip if already rated or already in unrated
-    ratings = _load_ratings()
-    if any(r.get("videoId") == video_id for r in ratings):
-        return jsonify({"skipped": True, "reason": "already rated"}), 200
-
-    unrated = _load_unrated()
-    if any(u.get("videoId") == video_id for u in unrated):
-        return jsonify({"skipped": True, "reason": "already in unrated"}), 200
-
-    entry = {
-        "id": str(uuid.uuid4()),
-        "videoId": video_id,
-        "title": data.get("title", "Unknown"),
-        "artist": data.get("artist", "Unknown Artist"),
-        "album": data.get("album", ""),
-        "albumId": data.get("albumId", ""),
-        "year": data.get("year", ""),
-        "albumArt": data.get("albumArt", ""),
-        "skippedAt": datetime.now().isoformat(),
-        "tags": [],
-        "notes": "",
-    }
+    _load_ratings()
+    _load_unrated()
+    with _write_lock:
+        # Skip if already rated or already in unrated
+        if video_id in _ratings_by_video:
+            return jsonify({"skipped": True, "reason": "already rated"}), 200
+        if video_id in _unrated_video_ids:
+            return jsonify({"skipped": True, "reason": "already in unrated"}), 200
+
+        entry = {
+            "id": _new_id(),
+            "videoId": video_id,
+            "title": data.get("title", "Unknown"),
+            "artist": data.get("artist", "Unknown Artist"),
+            "album": data.get("album", ""),
+            "albumId": data.get("albumId", ""),
+            "year": data.get("year", ""),
+            "albumArt": data.get("albumArt", ""),
+            "skippedAt": _now_iso(),
+            "tags": [],
+            "notes": "",
+        }
 
-    unrated.append(entry)
-    _save_unrated(unrated)
-    return jsonify({"success": True, "entry": entry}), 201
+        _append_unrated(entry)
+    return _json_response({"success": True, "entry": entry}, 201)
 
 
 @app.route("/api/unrated/<entry_id>", methods=["DELETE"])
 def delete_unrated(entry_id):
     """Remove an unrated entry (dismiss it)."""
-    unrated = _load_unrated()
-    original_len = len(unrated)
-    unrated = [u for u in unrated if u.get("id") != entry_id]
+    _load_unrated()
+    with _write_lock:
+        entry = _unrated_by_id.get(entry_id)
+        if not entry:
+            return jsonify({"error": "Entry not found"}), 404
 
-    if len(unrated) == original_len:
-        return jsonify({"error": "Entry not found"}), 404
-
-    _save_unrated(unrated)
+        _remove_unrated(entry)
     return jsonify({"success": True})
 
 
 @app.route("/api/unrated/all", methods=["DELETE"])
 def delete_all_unrated():
     """Dismiss all unrated songs."""
-    _save_unrated([])
+    with _write_lock:
+        _save_unrated([])
     return jsonify({"success": True})
 
 
@@ -1041,71 +1772,87 @@ def rate_unrated(entry_id):
         return jsonify({"error": "No data provided"}), 400
 
     rating = data.get("rating")
-    settings = _load_settings()
-    r_min, r_max = settings["ratingMin"], settings["ratingMax"]
-    if rating is None or not isinstance(rating, (int, float)) or not (r_min <= rating <= r_max):
-        return jsonify({"error": f"rating must be between {r_min} and {r_max}"}), 400
-
-    # Find in unrated
-    unrated = _load_unrated()
-    entry = next((u for u in unrated if u.get("id") == entry_id), None)
-    if not entry:
-        return jsonify({"error": "Unrated entry not found"}), 404
+    error = _rating_error(rating)
+    if error:
+        return jsonify({"error": error}), 400
 
-    # Check not already rated
     ratings = _load_ratings()
-    if any(r.get("videoId") == entry.get("videoId") for r in ratings):
-        # Remove from unrated and skip
-        unrated = [u for u in unrated if u.get("id") != entry_id]
-        _save_unrated(unrated)
-        return jsonify({"error": "Song already rated", "duplicate": True}), 409
-
-    # Create rated entry
-    rated_entry = {
-        "id": str(uuid.uuid4()),
-        "videoId": entry.get("videoId"),
-        "title": data.get("title", entry.get("title", "Unknown")),
-        "artist": data.get("artist", entry.get("artist", "Unknown Artist")),
-        "album": data.get("album", entry.get("album", "")),
-        "year": data.get("year", entry.get("year", "")),
-        "albumArt": entry.get("albumArt", ""),
-        "rating": rating,
-        "ratedAt": datetime.now().isoformat(),
-        "tags": data.get("tags", []),
-        "notes": data.get("notes", ""),
-    }
+    _load_unrated()
+    with _write_lock:
+        # Find in unrated
+        entry = _unrated_by_id.get(entry_id)
+        if not entry:
+            return jsonify({"error": "Unrated entry not found"}), 404
+
+        # Check not already rated
+        if entry.get("videoId") in _ratings_by_video:
+            # Remove from unrated and skip
+            _remove_unrated(entry)
+            return jsonify({"error": "Song already rated", "duplicate": True}), 409
+
+        # Create rated entry
+        rated_entry = {
+            "id": _new_id(),
+            "videoId": entry.get("videoId"),
+            "title": data.get("title", entry.get("title", "Unknown")),
+            "artist": data.get("artist", entry.get("artist", "Unknown Artist")),
+            "album": data.get("album", entry.get("album", "")),
+            "year": data.get("year", entry.get("year", "")),
+            "albumArt": entry.get("albumArt", ""),
+            "rating": rating,
+            "ratedAt": _now_iso(),
+            "tags": data.get("tags", []),
+            "notes": data.get("notes", ""),
+        }
+
+        ratings.append(rated_entry)
+        _index_rating(rated_entry)
+        _log_rating(rated_entry)
+
+        # Remove from unrated
+        _remove_unrated(entry)
 
-    ratings.append(rated_entry)
-    _save_ratings(ratings)
+    return _json_response({"success": True, "entry": rated_entry}, 201)
 
-    # Remove from unrated
-    unrated = [u for u in unrated if u.get("id") != entry_id]
-    _save_unrated(unrated)
 
-    return jsonify({"success": True, "entry": rated_entry}), 201
+# Streamed exports are flushed to the client in chunks of roughly this many characters
+EXPORT_CHUNK_SIZE = 64 * 1024
+
+# Column order of the CSV export; export_csv builds each row in this order
+_CSV_FIELDS = ("id", "videoId", "title", "artist", "album", "year",
+               "albumArt", "rating", "ratedAt", "updatedAt", "tags", "notes")
 
 
 @app.route("/api/export/csv")
 def export_csv():
-    """Export all ratings as CSV for data analysis."""
-    ratings = _load_ratings()
+    """Export all ratings as CSV for data analysis, streamed in ~64 KB chunks."""
+    ratings = list(_load_ratings())  # snapshot so concurrent edits can't disturb the stream
 
-    output = io.StringIO()
-    if ratings:
-        fieldnames = ["id", "videoId", "title", "artist", "album", "year",
-                       "albumArt", "rating", "ratedAt", "updatedAt", "tags", "notes"]
-        writer = csv.DictWriter(output, fieldnames=fieldnames, extrasaction="ignore")
-        writer.writeheader()
+    def generate():
+        if not ratings:
+            return
+        output = io.StringIO()
+        writer = csv.writer(output)
+        writer.writerow(_CSV_FIELDS)
         for r in ratings:
-            row = dict(r)
+            get = r.get
+            tags = get("tags", "")
             # Convert tags list to semicolon-separated string
-            if isinstance(row.get("tags"), list):
-                row["tags"] = "; ".join(row["tags"])
-            writer.writerow(row)
+            if isinstance(tags, list):
+                tags = "; ".join(tags)
+            writer.writerow((
+                get("id", ""), get("videoId", ""), get("title", ""), get("artist", ""),
+                get("album", ""), get("year", ""), get("albumArt", ""), get("rating", ""),
+                get("ratedAt", ""), get("updatedAt", ""), tags, get("notes", ""),
+            ))
+            if output.tell() >= EXPORT_CHUNK_SIZE:
+                yield output.getvalue()
+                output.seek(0)
+                output.truncate()
+        yield output.getvalue()
 
-    csv_content = output.getvalue()
     return Response(
-        csv_content,
+        generate(),
         mimetype="text/csv",
         headers={"Content-Disposition": "attachment; filename=song_ratings.csv"},
     )
@@ -1113,10 +1860,27 @@ def export_csv():
 
 @app.route("/api/export/json")
 def export_json():
-    """Export all ratings as formatted JSON for data analysis."""
-    ratings = _load_ratings()
+    """Export all ratings as formatted JSON for data analysis, streamed in ~64 KB chunks."""
+    ratings = list(_load_ratings())  # snapshot so concurrent edits can't disturb the stream
+
+    def generate():
+        if not ratings:
+            yield b"[]"
+            return
+        # Same bytes as _dumps(ratings): each entry indented one level inside the array
+        chunk = bytearray(b"[\n  ")
+        sep = b""
+        for r in ratings:
+            chunk += sep + _dumps(r).replace(b"\n", b"\n  ")
+            sep = b",\n  "
+            if len(chunk) >= EXPORT_CHUNK_SIZE:
+                yield bytes(chunk)
+                chunk.clear()
+        chunk += b"\n]"
+        yield bytes(chunk)
+
     return Response(
-        json.dumps(ratings, indent=2, ensure_ascii=False),
+        generate(),
         mimetype="application/json",
         headers={"Content-Disposition": "attachment; filename=song_ratings.json"},
     )
@@ -1127,32 +1891,44 @@ def _compute_stats(ratings):
     if not ratings:
         return {"total": 0}
 
-    numeric_ratings = [r["rating"] for r in ratings if isinstance(r.get("rating"), (int, float))]
-
-    # Count by artist
+    # Single pass: overall and per-artist running totals plus the distribution
+    overall = {"n": 0, "total": 0, "min": None, "max": None}
     artist_counts = {}
-    artist_avg = {}
+    artist_scores = {}  # artist → [rated songs, rating sum]
+    buckets = [0] * 11  # rounded rating 1-10 → count; index 0 unused
+    other_buckets = {}  # ratings outside 1-10 when the configured range is wider
     for r in ratings:
         a = r.get("artist", "Unknown")
         artist_counts[a] = artist_counts.get(a, 0) + 1
-        if a not in artist_avg:
-            artist_avg[a] = []
-        if isinstance(r.get("rating"), (int, float)):
-            artist_avg[a].append(r["rating"])
-
-    top_artists = sorted(artist_counts.items(), key=lambda x: x[1], reverse=True)[:10]
-    artist_averages = {a: round(sum(rs) / len(rs), 2) for a, rs in artist_avg.items() if rs}
-
-    # Rating distribution
-    distribution = {str(i): 0 for i in range(1, 11)}
-    for r in numeric_ratings:
-        distribution[str(int(round(r)))] = distribution.get(str(int(round(r))), 0) + 1
-
+        rating = r.get("rating")
+        if rating is None:
+            continue
+        _add_score(overall, rating)
+        acc = artist_scores.get(a)
+        if acc is None:
+            artist_scores[a] = [1, rating]
+        else:
+            acc[0] += 1
+            acc[1] += rating
+        bucket = int(round(rating))
+        if 0 < bucket <= 10:
+            buckets[bucket] += 1
+        else:
+            other_buckets[bucket] = other_buckets.get(bucket, 0) + 1
+
+    distribution = {str(i): buckets[i] for i in range(1, 11)}
+    for bucket, count in other_buckets.items():
+        distribution[str(bucket)] = count
+
+    top_artists = heapq.nlargest(10, artist_counts.items(), key=lambda x: x[1])
+    artist_averages = {a: round(total / n, 2) for a, (n, total) in artist_scores.items()}
+
+    n = overall["n"]
     return {
         "total": len(ratings),
-        "averageRating": round(sum(numeric_ratings) / len(numeric_ratings), 2) if numeric_ratings else 0,
-        "highestRating": max(numeric_ratings) if numeric_ratings else 0,
-        "lowestRating": min(numeric_ratings) if numeric_ratings else 0,
+        "averageRating": round(overall["total"] / n, 2) if n else 0,
+        "highestRating": overall["max"] if n else 0,
+        "lowestRating": overall["min"] if n else 0,
         "topArtists": top_artists,
         "artistAverages": artist_averages,
         "ratingDistribution": distribution,
@@ -1182,9 +1958,17 @@ if __name__ == "__main__":
     else:
         print("  ⚠ YTMusic not authenticated — setup wizard will appear in browser")
 
+    # Parse ratings up front so the first request doesn't pay for it
+    print(f"  ✓ Loaded {len(_load_ratings())} ratings")
+
     local_ip = _get_local_ip()
     print(f"  → Ratings file: {RATINGS_FILE}")
     print(f"  → Local:   http://localhost:5000")
     print(f"  → Network: http://{local_ip}:5000")
     print("=" * 50)
-    app.run(host="0.0.0.0", debug=True, port=5000, use_reloader=False)
+    if "--dev" in sys.argv:
+        # Werkzeug dev server with the debugger, for local debugging only
+        app.run(host="0.0.0.0", debug=True, port=5000, use_reloader=False)
+    else:
+        from waitress import serve
+        serve(app, host="0.0.0.0", port=5000, threads=8)
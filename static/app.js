@@ -577,6 +577,22 @@ async function enrichYearIfNeeded(track) {
     }
 }
 
+// Fetch missing album years for a list of tracks in one request, filling
+// track.year in place so picking one of them doesn't need its own lookup
+async function prefetchYears(tracks) {
+    const ids = [...new Set(tracks.filter((t) => !t.year && t.albumId).map((t) => t.albumId))];
+    if (!ids.length) return;
+
+    const data = await api("/api/enrich", {
+        method: "POST",
+        body: JSON.stringify({ albumIds: ids }),
+    });
+    if (!data || !data.years) return;
+    for (const t of tracks) {
+        if (!t.year && data.years[t.albumId]) t.year = data.years[t.albumId];
+    }
+}
+
 // ─── Now Playing UI ────────────────────────────────────────────
 function showEmptyState() {
     dom.nowPlayingEmpty.classList.remove("hidden");
@@ -1112,6 +1128,8 @@ async function doSongSearch() {
                 </div>`;
         }).join("");
 
+        prefetchYears(results);
+
         // Attach click handlers
         dom.searchResults.querySelectorAll(".search-result-item").forEach((el, i) => {
             el.addEventListener("click", () => {
@@ -1172,6 +1190,7 @@ async function loadAltVersions(track) {
             dom.altVersionsList.innerHTML = '<div class="alt-versions-empty">No other versions found</div>';
             return;
         }
+        prefetchYears(alts);
 
         renderAltVersions(alts, track.videoId);
     } catch (e) {